@@ -1,5 +1,7 @@
 import inspect
-import pprint
+import sys
+import time
+from datetime import datetime, timezone
 from typing import Any, AsyncGenerator, Dict, Optional, List, Union
 import logging
 
@@ -10,286 +12,493 @@ from agentops.helpers import get_ISO_time, check_call_stack_for_agent_id
 from agentops.llms.providers.instrumented_provider import InstrumentedProvider
 
 
+# Interned keys for the normalized prompt dicts, shared across every message
+# and every call instead of re-created per comprehension.
+_CONTENT_KEY = sys.intern("content")
+_ROLE_KEY = sys.intern("role")
+
+
+def _iso_from_epoch(timestamp: float) -> str:
+    """Format an epoch timestamp captured on the hot path as ISO 8601 UTC."""
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+
+class _StreamState:
+    """Per-response state shared between a stream wrapper and its chunk handlers."""
+
+    # One _StreamState is allocated per LLM call; __slots__ keeps it to a bare
+    # struct without a per-instance __dict__.
+    __slots__ = (
+        "kwargs",
+        "init_timestamp",
+        "session",
+        "model_id",
+        "normalized_prompt",
+        "cached_agent_id",
+        "stack",
+        "completion_parts",
+        "tool_delta_parts",
+        "error_reported",
+    )
+
+    def __init__(
+        self,
+        kwargs: Dict,
+        init_timestamp: str,
+        session: Optional[Session],
+        model_id: str,
+        normalized_prompt: List[Dict],
+        cached_agent_id: Optional[Any],
+    ):
+        self.kwargs = kwargs
+        self.init_timestamp = init_timestamp
+        self.session = session
+        self.model_id = model_id
+        self.normalized_prompt = normalized_prompt
+        self.cached_agent_id = cached_agent_id
+        self.stack: List[Dict] = []
+        # Streamed deltas are collected here and joined once on the terminal
+        # event; growing a string with += is quadratic in stream length.
+        self.completion_parts: List[str] = []
+        self.tool_delta_parts: List[str] = []
+        self.error_reported = False
+
+
 class LlamaStackClientProvider(InstrumentedProvider):
     original_complete = None
     original_create_turn = None
+    original_acreate_turn = None
+
+    # Imported llama_stack_client classes, cached so override/undo_override
+    # do not repeat the import machinery lookup.
+    _inference_resource = None
+    _agent_class = None
 
     def __init__(self, client):
         super().__init__(client)
         self._provider_name = "LlamaStack"
 
+    def _get_inference_resource(self):
+        if self._inference_resource is None:
+            from llama_stack_client.resources import InferenceResource
+
+            LlamaStackClientProvider._inference_resource = InferenceResource
+        return self._inference_resource
+
+    def _get_agent_class(self):
+        if self._agent_class is None:
+            from llama_stack_client.lib.agents.agent import Agent
+
+            LlamaStackClientProvider._agent_class = Agent
+        return self._agent_class
+
     def handle_response(
-        self, response, kwargs, init_timestamp, session: Optional[Session] = None, metadata: Optional[Dict] = {}
+        self, response, kwargs, init_timestamp, session: Optional[Session] = None, metadata: Optional[Dict] = None
     ) -> dict:
         """Handle responses for LlamaStack"""
 
+        # Normalize the prompt and resolve the model id once per response; the
+        # streaming callbacks only need to attach them on their terminal events.
+        # Guarded so a message shape we cannot index breaks the recording, never
+        # the instrumented call itself.
         try:
-            stack = []
-            accum_delta = None
-            accum_tool_delta = None
-            # tool_event = None
-            # llm_event = None
-
-            def handle_stream_chunk(chunk: dict):
-                nonlocal stack
-
-                # NOTE: prompt/completion usage not returned in response when streaming
-
-                try:
-                    nonlocal accum_delta
-
-                    if chunk.event.event_type == "start":
-                        llm_event = LLMEvent(init_timestamp=get_ISO_time(), params=kwargs)
-                        stack.append({"event_type": "start", "event": llm_event})
-                        accum_delta = chunk.event.delta
-                    elif chunk.event.event_type == "progress":
-                        accum_delta += chunk.event.delta
-                    elif chunk.event.event_type == "complete":
-                        if (
-                            stack[-1]["event_type"] == "start"
-                        ):  # check if the last event in the stack is a step start event
-                            llm_event = stack.pop().get("event")
-                            llm_event.prompt = [
-                                {"content": message.content, "role": message.role} for message in kwargs["messages"]
-                            ]
-                            llm_event.agent_id = check_call_stack_for_agent_id()
-                            llm_event.model = kwargs["model_id"]
-                            llm_event.prompt_tokens = None
-                            llm_event.completion = accum_delta or kwargs["completion"]
-                            llm_event.completion_tokens = None
-                            llm_event.end_timestamp = get_ISO_time()
-                            self._safe_record(session, llm_event)
-
-                except Exception as e:
-                    llm_event = LLMEvent(init_timestamp=init_timestamp, end_timestamp=get_ISO_time(), params=kwargs)
-                    self._safe_record(session, ErrorEvent(trigger_event=llm_event, exception=e))
-
-                    kwargs_str = pprint.pformat(kwargs)
-                    chunk = pprint.pformat(chunk)
-                    logger.warning(
-                        f"Unable to parse a chunk for LLM call. Skipping upload to AgentOps\n"
-                        f"chunk:\n {chunk}\n"
-                        f"kwargs:\n {kwargs_str}\n"
-                    )
-
-            def handle_stream_agent(chunk: dict):
-                # NOTE: prompt/completion usage not returned in response when streaming
-
-                # nonlocal llm_event
-                nonlocal stack
-
-                if session is not None:
-                    llm_event.session_id = session.session_id
-
-                try:
-                    if chunk.event.payload.event_type == "turn_start":
-                        logger.debug("turn_start")
-                        stack.append({"event_type": chunk.event.payload.event_type, "event": None})
-                    elif chunk.event.payload.event_type == "step_start":
-                        logger.debug("step_start")
-                        llm_event = LLMEvent(init_timestamp=get_ISO_time(), params=kwargs)
-                        stack.append({"event_type": chunk.event.payload.event_type, "event": llm_event})
-                    elif chunk.event.payload.event_type == "step_progress":
-                        if (
-                            chunk.event.payload.step_type == "inference"
-                            and chunk.event.payload.text_delta_model_response
-                        ):
-                            nonlocal accum_delta
-                            delta = chunk.event.payload.text_delta_model_response
-
-                            if accum_delta:
-                                accum_delta += delta
-                            else:
-                                accum_delta = delta
-                        elif chunk.event.payload.step_type == "inference" and chunk.event.payload.tool_call_delta:
-                            if chunk.event.payload.tool_call_delta.parse_status == "started":
-                                logger.debug("tool_started")
-                                tool_event = ToolEvent(init_timestamp=get_ISO_time(), params=kwargs)
-                                tool_event.name = "tool_started"
-
-                                stack.append({"event_type": "tool_started", "event": tool_event})
-
-                            elif chunk.event.payload.tool_call_delta.parse_status == "in_progress":
-                                nonlocal accum_tool_delta
-                                delta = chunk.event.payload.tool_call_delta.content
-                                if accum_tool_delta:
-                                    accum_tool_delta += delta
-                                else:
-                                    accum_tool_delta = delta
-                            elif chunk.event.payload.tool_call_delta.parse_status == "success":
-                                logger.debug("ToolExecution - success")
-                                if (
-                                    stack[-1]["event_type"] == "tool_started"
-                                ):  # check if the last event in the stack is a tool execution event
-                                    tool_event = stack.pop().get("event")
-                                    tool_event.end_timestamp = get_ISO_time()
-                                    tool_event.params["completion"] = accum_tool_delta
-                                    self._safe_record(session, tool_event)
-                            elif chunk.event.payload.tool_call_delta.parse_status == "failure":
-                                logger.warning("ToolExecution - failure")
-                                if stack[-1]["event_type"] == "ToolExecution - started":
-                                    tool_event = stack.pop().get("event")
-                                    tool_event.end_timestamp = get_ISO_time()
-                                    tool_event.params["completion"] = accum_tool_delta
-                                    self._safe_record(
-                                        session,
-                                        ErrorEvent(
-                                            trigger_event=tool_event, exception=Exception("ToolExecution - failure")
-                                        ),
-                                    )
-
-                    elif chunk.event.payload.event_type == "step_complete":
-                        logger.debug("Step complete event received")
-
-                        if chunk.event.payload.step_type == "inference":
-                            logger.debug("Step complete inference")
-
-                            if stack[-1]["event_type"] == "step_start":
-                                llm_event = stack.pop().get("event")
-                                llm_event.prompt = [
-                                    {"content": message["content"], "role": message["role"]}
-                                    for message in kwargs["messages"]
-                                ]
-                                llm_event.agent_id = check_call_stack_for_agent_id()
-                                llm_event.model = metadata.get("model_id", "Unable to identify model")
-                                llm_event.prompt_tokens = None
-                                llm_event.completion = accum_delta or kwargs["completion"]
-                                llm_event.completion_tokens = None
-                                llm_event.end_timestamp = get_ISO_time()
-                                self._safe_record(session, llm_event)
-                            else:
-                                logger.warning("Unexpected event stack state for inference step complete")
-                        elif chunk.event.payload.step_type == "tool_execution":
-                            if stack[-1]["event_type"] == "tool_started":
-                                logger.debug("tool_complete")
-                                tool_event = stack.pop().get("event")
-                                tool_event.name = "tool_complete"
-                                tool_event.params["completion"] = accum_tool_delta
-                                self._safe_record(session, tool_event)
-                    elif chunk.event.payload.event_type == "turn_complete":
-                        if stack[-1]["event_type"] == "turn_start":
-                            logger.debug("turn_start")
-                        pass
-
-                except Exception as e:
-                    llm_event = LLMEvent(init_timestamp=init_timestamp, end_timestamp=get_ISO_time(), params=kwargs)
-
-                    self._safe_record(session, ErrorEvent(trigger_event=llm_event, exception=e))
-
-                    kwargs_str = pprint.pformat(kwargs)
-                    chunk = pprint.pformat(chunk)
-                    logger.warning(
-                        f"Unable to parse a chunk for LLM call. Skipping upload to AgentOps\n"
-                        f"chunk:\n {chunk}\n"
-                        f"kwargs:\n {kwargs_str}\n"
-                    )
-
-            if kwargs.get("stream", False):
-
-                def generator():
-                    for chunk in response:
-                        handle_stream_chunk(chunk)
-                        yield chunk
-
-                return generator()
-            elif inspect.isasyncgen(response):
-
-                async def agent_generator():
-                    async for chunk in response:
-                        handle_stream_agent(chunk)
-                        yield chunk
-
-                return agent_generator()
+            normalized_prompt = [
+                {
+                    _CONTENT_KEY: message.content if hasattr(message, "content") else message["content"],
+                    _ROLE_KEY: message.role if hasattr(message, "role") else message["role"],
+                }
+                for message in kwargs.get("messages") or []
+            ]
+
+            # Chat calls carry the model id in kwargs, agent turns pass it
+            # through metadata.
+            model_id = kwargs.get("model_id") or (metadata or {}).get("model_id", "Unable to identify model")
+        except Exception as e:
+            llm_event = LLMEvent(init_timestamp=init_timestamp, end_timestamp=get_ISO_time(), params=kwargs)
+            self._safe_record(session, ErrorEvent(trigger_event=llm_event, exception=e))
+            logger.warning(
+                "Unable to parse messages for LLM call. Recording with an empty prompt\nkwargs:\n %s\n",
+                kwargs,
+            )
+            normalized_prompt = []
+            model_id = "Unable to identify model"
+
+        # The agent on the call stack cannot change between chunks of one
+        # response, so resolve it once instead of walking the stack per chunk.
+        cached_agent_id = check_call_stack_for_agent_id()
+
+        state = _StreamState(
+            kwargs=kwargs,
+            init_timestamp=init_timestamp,
+            session=session,
+            model_id=model_id,
+            normalized_prompt=normalized_prompt,
+            cached_agent_id=cached_agent_id,
+        )
+
+        # Pick the handler once instead of re-dispatching per chunk. Only agent
+        # turns (identified by the metadata the create_turn patch passes) hand
+        # back generators, so plain chat completions skip the inspect checks.
+        if kwargs.get("stream", False):
+            return self._handle_stream_chat(response, state)
+        elif metadata is not None:
+            if inspect.isasyncgen(response):
+                return self._handle_stream_agent_async(response, state)
             elif inspect.isgenerator(response):
+                return self._handle_stream_agent_sync(response, state)
+        return self._handle_completion(response, state)
 
-                def agent_generator():
-                    for chunk in response:
-                        handle_stream_agent(chunk)
-                        yield chunk
-
-                return agent_generator()
-            else:
-                llm_event = LLMEvent(init_timestamp=init_timestamp, params=kwargs)
-                if session is not None:
-                    llm_event.session_id = session.session_id
-
-                llm_event.returns = response
-                llm_event.agent_id = check_call_stack_for_agent_id()
-                llm_event.model = kwargs["model_id"]
-                llm_event.prompt = [
-                    {"content": message.content, "role": message.role} for message in kwargs["messages"]
-                ]
-                llm_event.prompt_tokens = None
-                llm_event.completion = response.completion_message.content
-                llm_event.completion_tokens = None
-                llm_event.end_timestamp = get_ISO_time()
+    def _handle_completion(self, response, state):
+        kwargs = state.kwargs
+        session = state.session
 
-                self._safe_record(session, llm_event)
+        try:
+            llm_event = LLMEvent(init_timestamp=state.init_timestamp, params=kwargs)
+            if session is not None:
+                llm_event.session_id = session.session_id
+
+            llm_event.returns = response
+            llm_event.agent_id = state.cached_agent_id
+            llm_event.model = state.model_id
+            llm_event.prompt = state.normalized_prompt
+            llm_event.prompt_tokens = None
+            llm_event.completion = response.completion_message.content
+            llm_event.completion_tokens = None
+            llm_event.end_timestamp = get_ISO_time()
+
+            self._safe_record(session, llm_event)
         except Exception as e:
+            llm_event = LLMEvent(
+                init_timestamp=state.init_timestamp, end_timestamp=get_ISO_time(), params=kwargs
+            )
             self._safe_record(session, ErrorEvent(trigger_event=llm_event, exception=e))
-            kwargs_str = pprint.pformat(kwargs)
-            response = pprint.pformat(response)
             logger.warning(
-                f"Unable to parse response for LLM call. Skipping upload to AgentOps\n"
-                f"response:\n {response}\n"
-                f"kwargs:\n {kwargs_str}\n"
+                "Unable to parse response for LLM call. Skipping upload to AgentOps\nresponse:\n %s\nkwargs:\n %s\n",
+                response,
+                kwargs,
             )
 
         return response
 
-    def _override_complete(self):
-        from llama_stack_client.resources import InferenceResource
+    def _handle_stream_chat(self, response, state):
+        def tap(chunk):
+            self._handle_stream_chunk(chunk, state)
+            return chunk
 
-        global original_complete
-        original_complete = InferenceResource.chat_completion
+        def generator():
+            # yield from a map drains the stream without a Python-level for
+            # loop re-entering the generator frame for every chunk.
+            yield from map(tap, response)
 
-        def patched_function(*args, **kwargs):
-            # Call the original function with its original arguments
-            init_timestamp = get_ISO_time()
-            session = kwargs.get("session", None)
-            if "session" in kwargs.keys():
-                del kwargs["session"]
-            result = original_complete(*args, **kwargs)
-            return self.handle_response(result, kwargs, init_timestamp, session=session)
+        return generator()
 
-        # Override the original method with the patched one
-        InferenceResource.chat_completion = patched_function
+    def _handle_stream_agent_sync(self, response, state):
+        def tap(chunk):
+            self._handle_stream_agent(chunk, state)
+            return chunk
 
-    def _override_create_turn(self):
-        from llama_stack_client.lib.agents.agent import Agent
+        def agent_generator():
+            yield from map(tap, response)
+
+        return agent_generator()
+
+    def _handle_stream_agent_async(self, response, state):
+        async def agent_generator():
+            async for chunk in response:
+                self._handle_stream_agent(chunk, state)
+                yield chunk
+
+        return agent_generator()
+
+    def _handle_stream_chunk(self, chunk, state):
+        # NOTE: prompt/completion usage not returned in response when streaming
+        kwargs = state.kwargs
+        session = state.session
+        stack = state.stack
+        completion_parts = state.completion_parts
+
+        try:
+            event = chunk.event
+            if event.event_type == "start":
+                # Only the raw start time is captured here; the LLMEvent and its
+                # ISO timestamps are materialized on the terminal event.
+                stack.append({"event_type": "start", "started_at": time.time()})
+                # A stream can carry several start/complete cycles; each start
+                # begins a fresh completion.
+                del completion_parts[:]
+                completion_parts.append(event.delta)
+            elif event.event_type == "progress":
+                completion_parts.append(event.delta)
+            elif event.event_type == "complete":
+                if stack[-1]["event_type"] == "start":  # check if the last event in the stack is a step start event
+                    llm_event = LLMEvent(init_timestamp=_iso_from_epoch(stack.pop()["started_at"]), params=kwargs)
+                    if session is not None:
+                        llm_event.session_id = session.session_id
+                    llm_event.prompt = state.normalized_prompt
+                    llm_event.agent_id = state.cached_agent_id
+                    llm_event.model = state.model_id
+                    llm_event.prompt_tokens = None
+                    llm_event.completion = "".join(completion_parts) or kwargs["completion"]
+                    llm_event.completion_tokens = None
+                    llm_event.end_timestamp = get_ISO_time()
+                    self._safe_record(session, llm_event)
 
-        self.original_create_turn = Agent.create_turn
+        except Exception as e:
+            # A malformed stream tends to fail on every subsequent chunk; report
+            # the first failure and skip the per-chunk event allocation after that.
+            if state.error_reported:
+                logger.debug("Skipping repeated chunk parse failure for LLM call: %s", e)
+                return
+            state.error_reported = True
+
+            llm_event = LLMEvent(
+                init_timestamp=state.init_timestamp, end_timestamp=get_ISO_time(), params=kwargs
+            )
+            self._safe_record(session, ErrorEvent(trigger_event=llm_event, exception=e))
+
+            logger.warning(
+                "Unable to parse a chunk for LLM call. Skipping upload to AgentOps\nchunk:\n %s\nkwargs:\n %s\n",
+                chunk,
+                kwargs,
+            )
+
+    def _handle_stream_agent(self, chunk, state):
+        # NOTE: prompt/completion usage not returned in response when streaming
+        kwargs = state.kwargs
+        session = state.session
 
-        def patched_function(*args, **kwargs):
-            # Call the original function with its original arguments
-            init_timestamp = get_ISO_time()
-            session = kwargs.get("session", None)
-            if "session" in kwargs.keys():
-                del kwargs["session"]
+        try:
+            payload = chunk.event.payload
+            handler = self._AGENT_EVENT_HANDLERS.get(payload.event_type)
+            if handler is not None:
+                handler(self, payload, state)
+
+        except Exception as e:
+            # A malformed stream tends to fail on every subsequent chunk; report
+            # the first failure and skip the per-chunk event allocation after that.
+            if state.error_reported:
+                logger.debug("Skipping repeated chunk parse failure for LLM call: %s", e)
+                return
+            state.error_reported = True
+
+            llm_event = LLMEvent(
+                init_timestamp=state.init_timestamp, end_timestamp=get_ISO_time(), params=kwargs
+            )
 
-            result = self.original_create_turn(*args, **kwargs)
-            return self.handle_response(
-                result,
+            self._safe_record(session, ErrorEvent(trigger_event=llm_event, exception=e))
+
+            logger.warning(
+                "Unable to parse a chunk for LLM call. Skipping upload to AgentOps\nchunk:\n %s\nkwargs:\n %s\n",
+                chunk,
                 kwargs,
-                init_timestamp,
-                session=session,
-                metadata={"model_id": args[0].agent_config.get("model")},
             )
 
+    def _on_turn_start(self, payload, state):
+        logger.debug("turn_start")
+        state.stack.append({"event_type": payload.event_type, "event": None})
+
+    def _on_step_start(self, payload, state):
+        logger.debug("step_start")
+        state.stack.append({"event_type": payload.event_type, "started_at": time.time()})
+
+    def _on_step_progress(self, payload, state):
+        if payload.step_type != "inference":
+            return
+        delta = payload.text_delta_model_response
+        if delta:
+            state.completion_parts.append(delta)
+        else:
+            tool_call_delta = payload.tool_call_delta
+            if tool_call_delta:
+                handler = self._TOOL_DELTA_HANDLERS.get(tool_call_delta.parse_status)
+                if handler is not None:
+                    handler(self, payload, state)
+
+    def _on_tool_started(self, payload, state):
+        logger.debug("tool_started")
+        state.stack.append({"event_type": "tool_started", "started_at": time.time()})
+
+    def _on_tool_in_progress(self, payload, state):
+        state.tool_delta_parts.append(payload.tool_call_delta.content)
+
+    def _on_tool_success(self, payload, state):
+        logger.debug("ToolExecution - success")
+        stack = state.stack
+        if stack[-1]["event_type"] == "tool_started":  # check if the last event in the stack is a tool execution event
+            tool_delta_parts = state.tool_delta_parts
+            tool_event = ToolEvent(init_timestamp=_iso_from_epoch(stack.pop()["started_at"]), params=state.kwargs)
+            tool_event.name = "tool_started"
+            tool_event.end_timestamp = get_ISO_time()
+            tool_event.params["completion"] = "".join(tool_delta_parts) if tool_delta_parts else None
+            self._safe_record(state.session, tool_event)
+
+    def _on_tool_failure(self, payload, state):
+        logger.warning("ToolExecution - failure")
+        stack = state.stack
+        if stack[-1]["event_type"] == "ToolExecution - started":
+            tool_delta_parts = state.tool_delta_parts
+            tool_event = ToolEvent(init_timestamp=_iso_from_epoch(stack.pop()["started_at"]), params=state.kwargs)
+            tool_event.name = "tool_started"
+            tool_event.end_timestamp = get_ISO_time()
+            tool_event.params["completion"] = "".join(tool_delta_parts) if tool_delta_parts else None
+            self._safe_record(
+                state.session,
+                ErrorEvent(trigger_event=tool_event, exception=Exception("ToolExecution - failure")),
+            )
+
+    def _on_step_complete(self, payload, state):
+        logger.debug("Step complete event received")
+        stack = state.stack
+
+        if payload.step_type == "inference":
+            logger.debug("Step complete inference")
+
+            if stack[-1]["event_type"] == "step_start":
+                completion_parts = state.completion_parts
+                llm_event = LLMEvent(
+                    init_timestamp=_iso_from_epoch(stack.pop()["started_at"]), params=state.kwargs
+                )
+                if state.session is not None:
+                    llm_event.session_id = state.session.session_id
+                llm_event.prompt = state.normalized_prompt
+                llm_event.agent_id = state.cached_agent_id
+                llm_event.model = state.model_id
+                llm_event.prompt_tokens = None
+                llm_event.completion = "".join(completion_parts) or state.kwargs["completion"]
+                llm_event.completion_tokens = None
+                llm_event.end_timestamp = get_ISO_time()
+                self._safe_record(state.session, llm_event)
+            else:
+                logger.warning("Unexpected event stack state for inference step complete")
+        elif payload.step_type == "tool_execution":
+            if stack[-1]["event_type"] == "tool_started":
+                logger.debug("tool_complete")
+                tool_delta_parts = state.tool_delta_parts
+                tool_event = ToolEvent(
+                    init_timestamp=_iso_from_epoch(stack.pop()["started_at"]), params=state.kwargs
+                )
+                tool_event.name = "tool_complete"
+                tool_event.params["completion"] = "".join(tool_delta_parts) if tool_delta_parts else None
+                self._safe_record(state.session, tool_event)
+
+    def _on_turn_complete(self, payload, state):
+        if state.stack[-1]["event_type"] == "turn_start":
+            logger.debug("turn_start")
+
+    # Dispatch tables for the agent stream: one dict lookup per chunk instead
+    # of walking an if/elif chain.
+    _AGENT_EVENT_HANDLERS = {
+        "turn_start": _on_turn_start,
+        "step_start": _on_step_start,
+        "step_progress": _on_step_progress,
+        "step_complete": _on_step_complete,
+        "turn_complete": _on_turn_complete,
+    }
+
+    _TOOL_DELTA_HANDLERS = {
+        "started": _on_tool_started,
+        "in_progress": _on_tool_in_progress,
+        "success": _on_tool_success,
+        "failure": _on_tool_failure,
+    }
+
+    def _override_complete(self):
+        InferenceResource = self._get_inference_resource()
+
+        # Capture the unpatched method at class level and only on the first
+        # override; tracker code builds a fresh provider per override call, and
+        # a repeated override() must not mistake an earlier patched wrapper for
+        # the original.
+        if LlamaStackClientProvider.original_complete is None:
+            LlamaStackClientProvider.original_complete = InferenceResource.chat_completion
+        # Read through the class: instance access would bind the stored plain
+        # function to the provider as a method.
+        original_complete = LlamaStackClientProvider.original_complete
+
+        if inspect.iscoroutinefunction(original_complete):
+
+            async def patched_function(*args, **kwargs):
+                # Await the original coroutine so concurrent calls keep pipelining
+                # instead of serializing behind the instrumentation
+                init_timestamp = get_ISO_time()
+                session = kwargs.pop("session", None)
+                result = await original_complete(*args, **kwargs)
+                return self.handle_response(result, kwargs, init_timestamp, session=session)
+
+        else:
+
+            def patched_function(*args, **kwargs):
+                # Call the original function with its original arguments
+                init_timestamp = get_ISO_time()
+                session = kwargs.pop("session", None)
+                result = original_complete(*args, **kwargs)
+                return self.handle_response(result, kwargs, init_timestamp, session=session)
+
         # Override the original method with the patched one
-        Agent.create_turn = patched_function
+        InferenceResource.chat_completion = patched_function
+
+    def _override_create_turn(self):
+        Agent = self._get_agent_class()
+
+        # As with chat_completion, only the first override records the original.
+        if LlamaStackClientProvider.original_create_turn is None:
+            LlamaStackClientProvider.original_create_turn = Agent.create_turn
+        # Override the original method with the patched one
+        Agent.create_turn = self._patch_create_turn(LlamaStackClientProvider.original_create_turn)
+
+        # Newer client versions also expose an async variant; wrap it the same way
+        if LlamaStackClientProvider.original_acreate_turn is None:
+            LlamaStackClientProvider.original_acreate_turn = getattr(Agent, "acreate_turn", None)
+        if LlamaStackClientProvider.original_acreate_turn is not None:
+            Agent.acreate_turn = self._patch_create_turn(LlamaStackClientProvider.original_acreate_turn)
+
+    def _patch_create_turn(self, original_turn):
+        if inspect.iscoroutinefunction(original_turn):
+
+            async def patched_function(*args, **kwargs):
+                # Await the original coroutine so concurrent calls keep pipelining
+                # instead of serializing behind the instrumentation
+                init_timestamp = get_ISO_time()
+                session = kwargs.pop("session", None)
+
+                result = await original_turn(*args, **kwargs)
+                return self.handle_response(
+                    result,
+                    kwargs,
+                    init_timestamp,
+                    session=session,
+                    metadata={"model_id": args[0].agent_config.get("model")},
+                )
+
+        else:
+
+            def patched_function(*args, **kwargs):
+                # Call the original function with its original arguments
+                init_timestamp = get_ISO_time()
+                session = kwargs.pop("session", None)
+
+                result = original_turn(*args, **kwargs)
+                return self.handle_response(
+                    result,
+                    kwargs,
+                    init_timestamp,
+                    session=session,
+                    metadata={"model_id": args[0].agent_config.get("model")},
+                )
+
+        return patched_function
 
     def override(self):
         self._override_complete()
         self._override_create_turn()
 
     def undo_override(self):
-        if self.original_complete is not None:
-            from llama_stack_client.resources import InferenceResource
+        cls = LlamaStackClientProvider
+        if cls.original_complete is not None:
+            self._get_inference_resource().chat_completion = cls.original_complete
 
-            InferenceResource.chat_completion = self.original_complete
-
-        if self.original_create_turn is not None:
-            from llama_stack_client.lib.agents.agent import Agent
+        if cls.original_create_turn is not None:
+            self._get_agent_class().create_turn = cls.original_create_turn
 
-            Agent.create_turn = self.original_create_turn
+        if cls.original_acreate_turn is not None:
+            self._get_agent_class().acreate_turn = cls.original_acreate_turn